@@ -0,0 +1,18 @@
+from src.benchmark import Benchmark
+from src.constants import AGENT_LEARNING_MODES, STATE_DISCRETIZERS
+
+def main():
+    player_path       = '../assets/sprites/player/player'
+    output_path       = '../assets/maps/generated'
+    sizes             = [18, 64, 128, 256]
+    learning_mode     = AGENT_LEARNING_MODES[0]
+    state_discretizer = STATE_DISCRETIZERS[1]
+
+    benchmark = Benchmark(
+        player_path, output_path, sizes, learning_mode,
+        steps=2000, seed=0, state_discretizer=state_discretizer,
+    )
+    benchmark.run()
+
+if __name__ == "__main__":
+    main()
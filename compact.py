@@ -0,0 +1,19 @@
+from src.compaction import Compaction
+from src.constants import AGENT_LEARNING_MODES, QTABLE_DTYPES
+
+def main():
+    player_path   = '../assets/sprites/player/player'
+    qtable_path   = '../agent.qtable'
+    output_path   = '../agent.compact.qtable'
+    map_paths     = [f'../assets/maps/json/map_{world}-1.json' for world in range(1, 6)]
+    learning_mode = AGENT_LEARNING_MODES[1]
+
+    compaction = Compaction(
+        player_path, qtable_path, map_paths, learning_mode,
+        thresholds=[0.0, 1.0, 10.0], min_visits=[0, 2], dtypes=QTABLE_DTYPES, episode_steps=2000,
+    )
+    compaction.run()
+    compaction.save(output_path, 1.0, 0, QTABLE_DTYPES[2])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from src.export import PolicyExport
+
+def main():
+    player_path = '../assets/sprites/player/player'
+    qtable_path = '../agent.qtable'
+    output_path = '../agent.policy'
+    map_paths   = [f'../assets/maps/json/map_{world}-1.json' for world in range(1, 6)]
+
+    policy_export = PolicyExport(player_path, qtable_path, output_path, map_paths, steps=2000)
+    policy_export.export()
+
+    result = policy_export.verify()
+    print(
+        f'{result["checked"]} states checked, {result["mismatches"]} mismatches, '
+        f'{result["size"] / 1E3:.1f} kB, loaded in {result["load_time"] * 1E3:.2f} ms, '
+        f'{result["lookup_time"] * 1E9:.0f} ns per lookup'
+    )
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,37 @@
 import arcade
 import matplotlib.pyplot as plt
 
-from src.constants import AGENT_LEARNING_MODES, PLAY_MODES, VIEW_MODES
+from src.constants import AGENT_LEARNING_MODES, PLAY_MODES, STATE_DISCRETIZERS, VIEW_MODES
 from src.environment import Environment
 
 def main():
-    player_path     = '../assets/sprites/player/player'
-    map_path        = '../assets/maps/json/map_5-2.json'
-    save_path       = '../agent.qtable'
-    play_mode       = PLAY_MODES[1]
-    view_mode       = VIEW_MODES[1]
-    learning_mode   = AGENT_LEARNING_MODES[1]
-    learning_rate   = 0.1
-    discount_factor = 0.9
+    player_path       = '../assets/sprites/player/player'
+    map_path          = '../assets/maps/json/map_5-2.json'
+    save_path         = '../agent.qtable'
+    play_mode         = PLAY_MODES[1]
+    view_mode         = VIEW_MODES[1]
+    learning_mode     = AGENT_LEARNING_MODES[1]
+    state_discretizer = STATE_DISCRETIZERS[0]
+    learning_rate     = 0.1
+    discount_factor   = 0.9
+    seed              = None
+    record_path       = None
+    replay_path       = None
+    replay_start      = 0
+    metrics_port      = None
+    population        = []
+    prune_every       = None
+    prune_threshold   = 0.0
+    prune_min_visits  = 0
 
     env = Environment()
     env.setup(
         player_path, map_path, save_path,
         play_mode, view_mode, learning_mode,
         learning_rate, discount_factor,
+        seed, record_path, replay_path, replay_start,
+        metrics_port, population, state_discretizer,
+        prune_every, prune_threshold, prune_min_visits,
     )
     arcade.run()
 
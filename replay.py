@@ -0,0 +1,17 @@
+from src.replay import Replay
+
+def main():
+    player_path     = '../assets/sprites/player/player'
+    trajectory_path = '../agent.trajectory'
+
+    replay = Replay(player_path, trajectory_path)
+    diverged_step = replay.run()
+
+    steps = len(replay.trajectory.steps)
+    if diverged_step is None:
+        print(f'identical trajectory over {steps} steps ({replay.steps_per_second:.0f} steps/s)')
+    else:
+        print(f'trajectory diverged after step {diverged_step} of {steps}')
+
+if __name__ == "__main__":
+    main()
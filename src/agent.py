@@ -2,70 +2,117 @@ import os
 import pickle
 import random
 
-from src.constants import AGENT_ACTIONS, AGENT_LEARNING_MODES
+from src.constants import AGENT_ACTIONS, AGENT_LEARNING_MODES, QTABLE_VISITS_SUFFIX, STATE_DISCRETIZERS
+from src.discretizer import make_discretizer
+from src.qtable import load_qtable, prune_qtable
 
 class Agent:
 
-    def __init__(self, x, y, x_bound, y_bound, learning_mode, learning_rate, discount_factor):
+    def __init__(
+        self, x, y, x_bound, y_bound, learning_mode, learning_rate, discount_factor,
+        noise=0.0, noise_decay=1E-4, seed=None, qtable=None, state_discretizer=STATE_DISCRETIZERS[0],
+        visits=None,
+    ):
         self.start_x = x
         self.start_y = y
         self.state = None
         self.score = 0
         self.history = []
-        self.noise = 0.0
+        self.noise = noise
+        self.noise_decay = noise_decay
+        self.random = random.Random(seed)
         
         self.learning_mode = learning_mode
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.qtable = {}
+        self.visits = {}
+        self.steps = 0
+        self.prune_every = None
+        self.prune_threshold = 0.0
+        self.prune_min_visits = 0
 
+        # Player positions are discretized into qtable keys when learning random
+        self.discretizer = None
         if self.is_learning_random():
-            self.init_qtable(x_bound, y_bound)
+            self.discretizer = make_discretizer(state_discretizer, x_bound, y_bound)
+
+        # A given qtable is shared with other agents
+        if qtable is not None:
+            self.qtable = qtable
+            self.visits = visits if visits is not None else {}
+        elif self.is_learning_random():
+            self.init_qtable()
 
     #region QTABLE
-    def init_qtable(self, x_bound, y_bound):
-        for state in self.get_all_states(x_bound, y_bound):
-            self.qtable[state] = {}
+    def init_qtable(self):
+        for key in self.discretizer.get_all_keys():
+            self.qtable[key] = {}
             for action in self.get_all_actions():
-                self.qtable[state][action] = 0.0
-
-    def get_all_states(self, x_bound, y_bound):
-        return [
-            (x, y) for x in range(0, x_bound + 1)
-            for y in range(0, y_bound + 1)
-        ]
+                self.qtable[key][action] = 0.0
 
     def add_state(self, state):
-        if state not in self.qtable:
-            self.qtable[state] = {}
-            for action in self.get_all_actions():
-                self.qtable[state][action] = 0.0
+        # Pruned keys are added back with zeros
+        for key in self.get_keys(state):
+            if key not in self.qtable:
+                self.qtable[key] = {}
+                for action in self.get_all_actions():
+                    self.qtable[key][action] = 0.0
+
+    def prune(self):
+        return prune_qtable(
+            self.qtable, self.visits, self.prune_threshold, self.prune_min_visits, self.get_keys(self.state),
+        )
 
     def get_all_actions(self):
         return AGENT_ACTIONS
+
+    def get_keys(self, state):
+        if self.discretizer is None:
+            return (state,)
+        return self.discretizer.keys(state)
+
+    def get_values(self, state):
+        # Tile coding states span several keys, their values are averaged
+        keys = self.get_keys(state)
+        if len(keys) == 1:
+            return self.qtable[keys[0]]
+        return {
+            action: sum(self.qtable[key][action] for key in keys) / len(keys)
+            for action in self.get_all_actions()
+        }
     #endregion QTABLE
 
     #region ACTIONS
     def best_action(self):
-        if self.noise > 0 and random.random() < self.noise:
+        if self.noise > 0 and self.random.random() < self.noise:
             return self.random_action()
-        return max(self.qtable[self.state], key=self.qtable[self.state].get)
+        self.add_state(self.state)
+        values = self.get_values(self.state)
+        return max(values, key=values.get)
     
     def random_action(self):
-        return random.choice(AGENT_ACTIONS)
+        return self.random.choice(AGENT_ACTIONS)
     
     def update(self, action, new_state, reward):
-        if self.is_learning_radar():
-            self.add_state(new_state)
+        # Agents sharing a pruned qtable may act from a state it lost
+        self.add_state(self.state)
+        self.add_state(new_state)
 
         if self.noise > 0:
-            self.noise -= 1E-4
+            self.noise -= self.noise_decay
         
         self.score += reward
-        maxQ = max(self.qtable[new_state].values())
-        delta = self.learning_rate * (reward + self.discount_factor * maxQ - self.qtable[self.state][action])
-        self.qtable[self.state][action] += delta
+        maxQ = max(self.get_values(new_state).values())
+        delta = self.learning_rate * (reward + self.discount_factor * maxQ - self.get_values(self.state)[action])
+        for key in self.get_keys(self.state):
+            self.qtable[key][action] += delta
+            self.visits[key] = self.visits.get(key, 0) + 1
         self.state = new_state
+
+        self.steps += 1
+        if self.prune_every and self.steps % self.prune_every == 0:
+            self.prune()
     
     def reset(self):
         self.history.append(self.score)
@@ -75,12 +122,18 @@ class Agent:
     #region SAVE
     def load_save(self, filename):
         if os.path.exists(filename):
-            with open(filename, 'rb') as file:
-                self.qtable = pickle.load(file)
+            self.qtable = load_qtable(filename)
+
+        # Visit counts are kept next to the qtable, older saves have none
+        if os.path.exists(filename + QTABLE_VISITS_SUFFIX):
+            with open(filename + QTABLE_VISITS_SUFFIX, 'rb') as file:
+                self.visits = pickle.load(file)
     
     def save(self, filename):
         with open(filename, 'wb') as file:
             pickle.dump(self.qtable, file)
+        with open(filename + QTABLE_VISITS_SUFFIX, 'wb') as file:
+            pickle.dump(self.visits, file)
     #endregion DATA
 
     #region UTILS
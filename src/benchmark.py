@@ -0,0 +1,77 @@
+import gc
+import os
+import time
+import tracemalloc
+
+from src.constants import PLAY_MODES, SIMULATION_DELTA_TIME, STATE_DISCRETIZERS, VIEW_MODES
+from src.generator import MapGenerator
+from src.simulation import Simulation
+
+class Benchmark:
+
+    def __init__(
+        self, player_path, output_path, sizes, learning_mode, steps=2000, seed=None,
+        state_discretizer=STATE_DISCRETIZERS[0],
+    ):
+        # Set origin path
+        file_path = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(file_path)
+
+        self.player_path = player_path
+        self.output_path = output_path
+        self.sizes = sizes
+        self.learning_mode = learning_mode
+        self.state_discretizer = state_discretizer
+        self.steps = steps
+        self.seed = seed
+        self.results = []
+
+    def run(self):
+        print(f'{"size":>10} {"sprites":>10} {"states":>10} {"load (s)":>10} {"memory (MB)":>12} {"steps/s":>10}')
+
+        for size in self.sizes:
+            map_path = MapGenerator(size, size, seed=self.seed).generate().save(
+                os.path.join(self.output_path, f'map_{size}x{size}.json')
+            )
+            result = self.run_map(size, map_path)
+            self.results.append(result)
+
+            print(
+                f'{result["size"]:>10} {result["sprites"]:>10} {result["states"]:>10} '
+                f'{result["load_time"]:>10.2f} {result["memory"] / 1E6:>12.1f} {result["steps_per_second"]:>10.0f}'
+            )
+
+        return self.results
+
+    def run_map(self, size, map_path):
+        gc.collect()
+
+        # Memory is traced while loading only, tracing would slow the steps down
+        tracemalloc.start()
+        start_time = time.perf_counter()
+
+        simulation = Simulation()
+        simulation.setup_simulation(
+            self.player_path, map_path, None,
+            PLAY_MODES[1], VIEW_MODES[1], self.learning_mode,
+            0.1, 0.9,
+            state_discretizer=self.state_discretizer,
+        )
+
+        load_time = time.perf_counter() - start_time
+        _, memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start_time = time.perf_counter()
+        for _ in range(self.steps):
+            simulation.update_simulation(SIMULATION_DELTA_TIME)
+        step_time = time.perf_counter() - start_time
+
+        return {
+            'size': f'{size}x{size}',
+            'sprites': sum(len(sprite_list) for sprite_list in simulation.scene.sprite_lists),
+            'states': len(simulation.agent.qtable),
+            'load_time': load_time,
+            'memory': memory,
+            'steps_per_second': self.steps / step_time,
+        }
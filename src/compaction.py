@@ -0,0 +1,105 @@
+import os
+import pickle
+
+from src.constants import PLAY_MODES, QTABLE_DTYPES, QTABLE_VISITS_SUFFIX, SIMULATION_DELTA_TIME, STATE_DISCRETIZERS, VIEW_MODES
+from src.qtable import CompactQTable, load_qtable, prune_qtable
+from src.simulation import Simulation
+
+class Compaction:
+
+    def __init__(
+        self, player_path, qtable_path, map_paths, learning_mode, state_discretizer=STATE_DISCRETIZERS[0],
+        thresholds=(0.0,), min_visits=(0,), dtypes=QTABLE_DTYPES, episode_steps=2000,
+    ):
+        # Set origin path
+        file_path = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(file_path)
+
+        self.player_path = player_path
+        self.qtable_path = qtable_path
+        self.map_paths = map_paths
+        self.learning_mode = learning_mode
+        self.state_discretizer = state_discretizer
+        self.thresholds = thresholds
+        self.min_visits = min_visits
+        self.dtypes = dtypes
+        self.episode_steps = episode_steps
+        self.results = []
+
+        self.qtable = load_qtable(qtable_path)
+
+        self.visits = {}
+        if os.path.exists(qtable_path + QTABLE_VISITS_SUFFIX):
+            with open(qtable_path + QTABLE_VISITS_SUFFIX, 'rb') as file:
+                self.visits = pickle.load(file)
+
+    def run(self):
+        print(
+            f'{"threshold":>10} {"visits":>7} {"dtype":>8} {"states":>10} '
+            f'{"size (kB)":>10} {"win rate":>9} {"steps":>8}'
+        )
+
+        for threshold in self.thresholds:
+            for min_visits in self.min_visits:
+                for dtype in self.dtypes:
+                    compacted = self.compact(threshold, min_visits, dtype)
+                    qtable = compacted.to_qtable() if isinstance(compacted, CompactQTable) else compacted
+                    win_rate, steps = self.evaluate(qtable)
+
+                    result = {
+                        'threshold': threshold,
+                        'min_visits': min_visits,
+                        'dtype': dtype,
+                        'states': len(qtable),
+                        'size': len(pickle.dumps(compacted)),
+                        'win_rate': win_rate,
+                        'steps': steps,
+                    }
+                    self.results.append(result)
+
+                    print(
+                        f'{threshold:>10} {min_visits:>7} {dtype:>8} {result["states"]:>10} '
+                        f'{result["size"] / 1E3:>10.1f} {win_rate:>9.2f} {steps:>8.0f}'
+                    )
+
+        return self.results
+
+    def compact(self, threshold, min_visits, dtype):
+        # Prune copies, every combination starts from the loaded qtable and visit counts
+        qtable = {state: dict(values) for state, values in self.qtable.items()}
+        prune_qtable(qtable, dict(self.visits), threshold, min_visits)
+
+        if dtype == QTABLE_DTYPES[0]:
+            return qtable
+        return CompactQTable.from_qtable(qtable, dtype)
+
+    def evaluate(self, qtable):
+        # Greedy policy without learning, one episode per map since the simulation is deterministic
+        wins = 0
+        win_steps = 0
+
+        for map_path in self.map_paths:
+            simulation = Simulation()
+            simulation.setup_simulation(
+                self.player_path, map_path, None,
+                PLAY_MODES[1], VIEW_MODES[0], self.learning_mode,
+                0.0, 0.0,
+                state_discretizer=self.state_discretizer,
+            )
+            simulation.agent.qtable = {state: dict(values) for state, values in qtable.items()}
+            simulation.agent.add_state(simulation.agent.state)
+            simulation.agent_greedy = True
+
+            for step in range(self.episode_steps):
+                simulation.update_simulation(SIMULATION_DELTA_TIME)
+                if simulation.win:
+                    wins += 1
+                    win_steps += step + 1
+                    break
+
+        return wins / len(self.map_paths), win_steps / max(wins, 1)
+
+    def save(self, output_path, threshold, min_visits, dtype):
+        with open(output_path, 'wb') as file:
+            pickle.dump(self.compact(threshold, min_visits, dtype), file)
+        return output_path
@@ -9,6 +9,9 @@ SCREEN_WIDTH  = int(TILE_PIXEL_SIZE * 18)
 SCREEN_HEIGHT = int(TILE_PIXEL_SIZE * 10)
 SCREEN_TITLE  = 'Mephistophelia'
 
+HUD_FONT_NAME    = ('calibri', 'arial')
+HUD_REFRESH_RATE = 10
+
 # GAME
 GRAVITY               = 1.5
 PLAYER_MOVEMENT_SPEED = 10
@@ -17,6 +20,8 @@ PLAYER_DASH_SPEED     = 25
 PLAYER_DASH_DURATION  = 0.1
 PLAYER_DASH_COOLDOWN  = 2
 
+SIMULATION_DELTA_TIME = 1 / 60
+
 PLAY_MODES = ['HUMAN', 'AGENT']
 VIEW_MODES = ['ANALYTIC', 'AUTO']
 
@@ -24,6 +29,8 @@ VIEW_MODES = ['ANALYTIC', 'AUTO']
 PLAYER_RIGHT_FACING = 0
 PLAYER_LEFT_FACING  = 1
 
+POPULATION_ALPHA = 128
+
 # MAP
 MAP_LAYER_GOAL        = 'Goal'
 MAP_LAYER_FOREGROUND  = 'Foreground'
@@ -32,6 +39,24 @@ MAP_LAYER_PLAYER      = 'Player'
 MAP_LAYER_BACKGROUND  = 'Background'
 MAP_LAYER_DEATHGROUND = 'Deathground'
 
+# Layer tags in the spatial index
+MAP_TAG_PLATFORMS   = 0b001
+MAP_TAG_DEATHGROUND = 0b010
+MAP_TAG_GOAL        = 0b100
+
+MAP_TILE_GROUND     = 2
+MAP_TILE_PLATFORM   = 3
+MAP_TILE_SKY        = 4
+MAP_TILE_GOAL       = 7
+MAP_TILE_START      = 6
+MAP_TILE_SPIKES     = 11
+MAP_TILE_LEFT_WALL  = 12
+MAP_TILE_RIGHT_WALL = 13
+
+# GENERATOR
+GENERATOR_JUMP_HEIGHT = 2
+GENERATOR_JUMP_LENGTH = 3
+
 # AGENT
 AGENT_REWARD_DEATH = -int(((TILE_PIXEL_SIZE * 18) / 2))
 AGENT_REWARD_GOAL  = int(TILE_PIXEL_SIZE * 18)
@@ -39,3 +64,19 @@ AGENT_REWARD_STEP  = -2
 
 AGENT_ACTIONS        = ['LEFT', 'RIGHT', 'JUMP_LEFT', 'JUMP_RIGHT']
 AGENT_LEARNING_MODES = ['RANDOM', 'RADAR']
+
+STATE_DISCRETIZERS = ['PIXEL', 'TILE', 'TILE_VELOCITY', 'TILE_CODING']
+
+# QTABLE
+QTABLE_DTYPES        = ['float64', 'float16', 'int8']
+QTABLE_VISITS_SUFFIX = '.visits'
+
+# METRICS
+METRICS_HOST   = '127.0.0.1'
+METRICS_WINDOW = 10
+
+# TRAJECTORY
+TRAJECTORY_ACTION_MASK      = 0b0011
+TRAJECTORY_RESET            = 0b0100
+TRAJECTORY_RESET_AGENT      = 0b1000
+TRAJECTORY_CHECKPOINT_STEPS = 256
@@ -0,0 +1,92 @@
+import math
+
+from src.constants import STATE_DISCRETIZERS, TILE_PIXEL_SIZE
+
+class PixelDiscretizer:
+    # Raw pixel positions, one state per (x, y)
+
+    def __init__(self, x_bound, y_bound):
+        self.x_bound = x_bound
+        self.y_bound = y_bound
+
+    def state(self, player):
+        return (int(player.center_x), int(player.center_y))
+
+    def keys(self, state):
+        return (state,)
+
+    def get_all_keys(self):
+        return [
+            (x, y) for x in range(0, self.x_bound + 1)
+            for y in range(0, self.y_bound + 1)
+        ]
+
+class TileDiscretizer:
+    # One integer state per map cell
+
+    def __init__(self, x_bound, y_bound, size=TILE_PIXEL_SIZE):
+        self.size = size
+        self.columns = math.ceil(x_bound / size)
+        self.rows = math.ceil(y_bound / size)
+
+    def cell(self, x, y, columns, rows):
+        column = min(max(int(x // self.size), 0), columns - 1)
+        row = min(max(int(y // self.size), 0), rows - 1)
+        return row * columns + column
+
+    def state(self, player):
+        return self.cell(player.center_x, player.center_y, self.columns, self.rows)
+
+    def keys(self, state):
+        return (state,)
+
+    def get_all_keys(self):
+        return range(self.columns * self.rows)
+
+class TileVelocityDiscretizer(TileDiscretizer):
+    # Map cell, with the sign of the horizontal and vertical speeds
+
+    def state(self, player):
+        cell = self.cell(player.center_x, player.center_y, self.columns, self.rows)
+        sign_x = (player.change_x > 0) - (player.change_x < 0)
+        sign_y = (player.change_y > 0) - (player.change_y < 0)
+        return cell * 9 + (sign_x + 1) * 3 + (sign_y + 1)
+
+    def get_all_keys(self):
+        return range(self.columns * self.rows * 9)
+
+class TileCodingDiscretizer(TileDiscretizer):
+    # One cell in each of several offset grids, the agent averages their values
+
+    def __init__(self, x_bound, y_bound, size=TILE_PIXEL_SIZE, tilings=4):
+        super().__init__(x_bound, y_bound, size)
+        self.tilings = tilings
+        self.cells = (self.columns + 1) * (self.rows + 1)
+
+    def state(self, player):
+        return tuple(
+            tiling * self.cells + self.cell(
+                player.center_x + tiling * self.size / self.tilings,
+                player.center_y + tiling * self.size / self.tilings,
+                self.columns + 1,
+                self.rows + 1,
+            )
+            for tiling in range(self.tilings)
+        )
+
+    def keys(self, state):
+        return state
+
+    def get_all_keys(self):
+        return range(self.tilings * self.cells)
+
+def make_discretizer(name, x_bound, y_bound):
+    if name == STATE_DISCRETIZERS[0]:
+        return PixelDiscretizer(x_bound, y_bound)
+    elif name == STATE_DISCRETIZERS[1]:
+        return TileDiscretizer(x_bound, y_bound)
+    elif name == STATE_DISCRETIZERS[2]:
+        return TileVelocityDiscretizer(x_bound, y_bound)
+    elif name == STATE_DISCRETIZERS[3]:
+        return TileCodingDiscretizer(x_bound, y_bound)
+    raise ValueError(f'Unknown state discretizer {name}')
@@ -0,0 +1,78 @@
+import os
+import time
+
+from src.constants import AGENT_ACTIONS, AGENT_LEARNING_MODES, PLAY_MODES, SIMULATION_DELTA_TIME, VIEW_MODES
+from src.agent import Agent
+from src.policy import POLICY_TABLE_SIZE, Policy, encode_radar_state
+from src.qtable import load_qtable
+from src.simulation import Simulation
+
+def compile_policy(qtable, metadata=None):
+    # Unknown states keep action 0, like the zeroed state an agent adds when it first sees one
+    table = bytearray(POLICY_TABLE_SIZE)
+    for state, values in qtable.items():
+        table[encode_radar_state(state)] = AGENT_ACTIONS.index(max(values, key=values.get))
+    return Policy(list(AGENT_ACTIONS), bytes(table), metadata)
+
+class PolicyExport:
+
+    def __init__(self, player_path, qtable_path, output_path, map_paths, steps=2000):
+        # Set origin path
+        file_path = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(file_path)
+
+        self.player_path = player_path
+        self.qtable_path = qtable_path
+        self.output_path = output_path
+        self.map_paths = map_paths
+        self.steps = steps
+        self.qtable = load_qtable(qtable_path)
+
+    def export(self):
+        policy = compile_policy(self.qtable, {'qtable': os.path.basename(self.qtable_path)})
+        policy.save(self.output_path)
+        return self.output_path
+
+    def verify(self):
+        # The exported policy must pick the agent's greedy action on every qtable state and every state met in play
+        start_time = time.perf_counter()
+        policy = Policy.load(self.output_path)
+        load_time = time.perf_counter() - start_time
+
+        checked = 0
+        mismatches = 0
+
+        agent = Agent(0, 0, 0, 0, AGENT_LEARNING_MODES[1], 0.0, 0.0, qtable=dict(self.qtable))
+        for state in self.qtable:
+            agent.state = state
+            checked += 1
+            mismatches += policy.action(state) != agent.best_action()
+
+        for map_path in self.map_paths:
+            simulation = Simulation()
+            simulation.setup_simulation(
+                self.player_path, map_path, None,
+                PLAY_MODES[1], VIEW_MODES[1], AGENT_LEARNING_MODES[1],
+                0.0, 0.0,
+            )
+            simulation.agent.qtable = {state: dict(values) for state, values in self.qtable.items()}
+
+            for _ in range(self.steps):
+                checked += 1
+                mismatches += policy.action(simulation.agent.state) != simulation.agent.best_action()
+                simulation.update_simulation(SIMULATION_DELTA_TIME)
+
+        # Lookup cost of the runtime alone, from an encoded state
+        code = encode_radar_state(simulation.agent.state)
+        start_time = time.perf_counter()
+        for _ in range(100000):
+            policy.action_index(code)
+        lookup_time = (time.perf_counter() - start_time) / 100000
+
+        return {
+            'checked': checked,
+            'mismatches': mismatches,
+            'size': os.path.getsize(self.output_path),
+            'load_time': load_time,
+            'lookup_time': lookup_time,
+        }
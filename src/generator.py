@@ -0,0 +1,284 @@
+import json
+import os
+import random
+from collections import deque
+
+from src.constants import \
+    GENERATOR_JUMP_HEIGHT, GENERATOR_JUMP_LENGTH, \
+    MAP_LAYER_BACKGROUND, MAP_LAYER_DEATHGROUND, MAP_LAYER_FOREGROUND, MAP_LAYER_GOAL, MAP_LAYER_PLATFORMS, MAP_LAYER_PLAYER, \
+    MAP_TILE_GOAL, MAP_TILE_GROUND, MAP_TILE_LEFT_WALL, MAP_TILE_PLATFORM, MAP_TILE_RIGHT_WALL, MAP_TILE_SKY, MAP_TILE_SPIKES, MAP_TILE_START
+
+# Tiled layer ids, in the order of the shipped maps
+MAP_LAYER_IDS = {
+    MAP_LAYER_BACKGROUND: 4,
+    MAP_LAYER_DEATHGROUND: 5,
+    MAP_LAYER_PLAYER: 2,
+    MAP_LAYER_PLATFORMS: 1,
+    MAP_LAYER_FOREGROUND: 3,
+    MAP_LAYER_GOAL: 6,
+}
+
+class MapGenerator:
+    # Tiles are addressed like the map properties: (x, y) from 1, y going up from the bottom row
+
+    def __init__(self, width, height, seed=None, density=0.05, attempts=20):
+        if width < 8 or height < 8:
+            raise ValueError(f'Map must be at least 8x8 tiles, got {width}x{height}')
+
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.density = density
+        self.attempts = attempts
+        self.random = random.Random(seed)
+
+        self.platforms = set()
+        self.deathground = set()
+        self.reserved = set()
+        self.start = None
+        self.goal = None
+
+    #region LAYOUT
+    def generate(self):
+        # Retry staircases stuck near the floor, the goal must be in the upper half of the map
+        for _ in range(self.attempts):
+            self.generate_layout()
+            if self.goal[1] > self.height // 2 and self.is_solvable():
+                return self
+        raise ValueError(f'Could not generate a solvable {self.width}x{self.height} map with seed {self.seed}')
+
+    def generate_layout(self):
+        self.platforms = set()
+        self.deathground = set()
+        self.reserved = set()
+
+        # Floor and walls
+        for x in range(1, self.width + 1):
+            self.platforms.add((x, 2))
+        for y in range(3, self.height + 1):
+            self.deathground.add((1, y))
+            self.deathground.add((self.width, y))
+
+        # Player stands on the floor
+        start_x = self.random.randint(2, self.width - 1)
+        self.start = (start_x, 3)
+        self.reserve_column(start_x, 3, 4)
+
+        # Climb a staircase of platforms, each one reachable from the last
+        segment = (start_x, start_x, 3)
+        direction = self.random.choice((-1, 1))
+        while True:
+            next_segment = self.next_segment(segment, direction)
+            if next_segment is None:
+                break
+            segment, direction = next_segment
+
+        left, right, y = segment
+        self.goal = (self.random.randint(left, right), y)
+
+        self.add_distractors()
+
+    def next_segment(self, segment, last_direction):
+        left, right, y = segment
+        candidates = [
+            (direction, gap, length, dy)
+            for direction in (-1, 1)
+            for gap in range(1, GENERATOR_JUMP_LENGTH)
+            for length in range(1, 7)
+            for dy in range(1, GENERATOR_JUMP_HEIGHT + 1)
+        ]
+        self.random.shuffle(candidates)
+        # Keep climbing the same way until a wall, highest steps first
+        candidates.sort(key=lambda candidate: (candidate[0] != last_direction, -candidate[3]))
+
+        for direction, gap, length, dy in candidates:
+            y2 = y + dy
+            if y2 + 2 > self.height:
+                continue
+
+            if direction > 0:
+                x, x2 = right, right + gap + 1
+                columns = range(x2, x2 + length)
+            else:
+                x, x2 = left, left - gap - 1
+                columns = range(x2 - length + 1, x2 + 1)
+
+            if columns.start < 2 or columns.stop - 1 > self.width - 1:
+                continue
+
+            cells = [(column, y2 - 1) for column in columns]
+            headroom = [(column, row) for column in columns for row in (y2, y2 + 1)]
+            clearance = self.jump_clearance(x, y, x2, y2)
+
+            if any(cell in self.reserved or cell in self.platforms for cell in cells):
+                continue
+            if any(not self.is_free(cell) for cell in headroom + clearance):
+                continue
+
+            self.platforms.update(cells)
+            self.reserved.update(headroom + clearance)
+            return (columns.start, columns.stop - 1, y2), direction
+
+        return None
+
+    def add_distractors(self):
+        count = int(self.density * self.width * self.height / 4)
+
+        for _ in range(count):
+            length = self.random.randint(2, 5)
+            x = self.random.randint(2, self.width - length)
+            y = self.random.randint(4, self.height - 2)
+            cells = [(column, y) for column in range(x, x + length)]
+            if all(cell not in self.reserved for cell in cells):
+                self.platforms.update(cells)
+
+        for _ in range(count // 4):
+            length = self.random.randint(1, 2)
+            x = self.random.randint(2, self.width - length)
+            cells = [(column, 3) for column in range(x, x + length)]
+            if all(cell not in self.reserved and abs(cell[0] - self.start[0]) > 3 for cell in cells):
+                self.deathground.update(cells)
+
+    def reserve_column(self, x, y, rows):
+        for row in range(y, y + rows):
+            self.reserved.add((x, row))
+    #endregion LAYOUT
+
+    #region SOLVER
+    def is_free(self, cell):
+        return cell not in self.platforms and cell not in self.deathground
+
+    def is_standing(self, cell):
+        x, y = cell
+        return (x, y - 1) in self.platforms and self.is_free((x, y)) and self.is_free((x, y + 1))
+
+    def jump_clearance(self, x, y, x2, y2):
+        # Walking needs the player height, jumping an extra row above the highest end
+        if abs(x2 - x) == 1 and y2 == y:
+            top = y + 1
+        else:
+            top = max(y, y2) + 2
+
+        step = 1 if x2 > x else -1
+        cells = [(x, row) for row in range(y, top + 1)]
+        cells += [(column, row) for column in range(x + step, x2, step) for row in range(min(y, y2), top + 1)]
+        cells += [(x2, row) for row in range(y2, top + 1)]
+        return cells
+
+    def next_cells(self, cell):
+        x, y = cell
+
+        for dx in range(-GENERATOR_JUMP_LENGTH, GENERATOR_JUMP_LENGTH + 1):
+            x2 = x + dx
+            if x2 < 2 or x2 > self.width - 1:
+                continue
+
+            # Jumps and walks to the same level or above
+            for dy in range(0, GENERATOR_JUMP_HEIGHT + 1):
+                target = (x2, y + dy)
+                if target != cell and self.is_standing(target) \
+                    and all(self.is_free(c) for c in self.jump_clearance(x, y, x2, y + dy)):
+                    yield target
+
+            # Falls land on the first platform below
+            if dx == 0 or not all(self.is_free((x2, row)) for row in (y, y + 1)):
+                continue
+            y2 = y - 1
+            while y2 > 2 and self.is_free((x2, y2)) and (x2, y2 - 1) not in self.platforms:
+                y2 -= 1
+            target = (x2, y2)
+            if y2 < y and self.is_standing(target) \
+                and all(self.is_free(c) for c in self.jump_clearance(x, y, x2, y)):
+                yield target
+
+    def is_solvable(self):
+        visited = {self.start}
+        queue = deque([self.start])
+
+        while queue:
+            cell = queue.popleft()
+            if cell == self.goal:
+                return True
+            for next_cell in self.next_cells(cell):
+                if next_cell not in visited:
+                    visited.add(next_cell)
+                    queue.append(next_cell)
+
+        return False
+    #endregion SOLVER
+
+    #region SAVE
+    def layer_data(self, tiles):
+        data = [0] * (self.width * self.height)
+        for (x, y), tile in tiles.items():
+            data[(self.height - y) * self.width + (x - 1)] = tile
+        return data
+
+    def layer(self, name, tiles, properties=None):
+        layer = {
+            "data": self.layer_data(tiles),
+            "height": self.height,
+            "id": MAP_LAYER_IDS[name],
+            "name": name,
+            "opacity": 1,
+            "type": "tilelayer",
+            "visible": True,
+            "width": self.width,
+            "x": 0,
+            "y": 0,
+        }
+        if properties:
+            layer["properties"] = [
+                {"name": key, "type": "string", "value": str(value)}
+                for key, value in properties.items()
+            ]
+        return layer
+
+    def to_json(self):
+        background = {}
+        for x in range(1, self.width + 1):
+            background[(x, 1)] = MAP_TILE_GROUND
+            for y in range(3, self.height + 1):
+                background[(x, y)] = MAP_TILE_SKY
+
+        deathground = {}
+        for x, y in self.deathground:
+            if x == 1:
+                deathground[(x, y)] = MAP_TILE_LEFT_WALL
+            elif x == self.width:
+                deathground[(x, y)] = MAP_TILE_RIGHT_WALL
+            else:
+                deathground[(x, y)] = MAP_TILE_SPIKES
+
+        return {
+            "compressionlevel": -1,
+            "height": self.height,
+            "infinite": False,
+            "layers": [
+                self.layer(MAP_LAYER_BACKGROUND, background),
+                self.layer(MAP_LAYER_DEATHGROUND, deathground),
+                self.layer(MAP_LAYER_PLAYER, {}, {"start_x": self.start[0], "start_y": self.start[1]}),
+                self.layer(MAP_LAYER_PLATFORMS, {cell: MAP_TILE_PLATFORM for cell in self.platforms}),
+                self.layer(MAP_LAYER_FOREGROUND, {self.start: MAP_TILE_START}),
+                self.layer(MAP_LAYER_GOAL, {self.goal: MAP_TILE_GOAL}, {"x": self.goal[0], "y": self.goal[1]}),
+            ],
+            "nextlayerid": 7,
+            "nextobjectid": 1,
+            "orientation": "orthogonal",
+            "renderorder": "right-down",
+            "tiledversion": "1.10.2",
+            "tileheight": 128,
+            "tilesets": [{"firstgid": 1, "source": "../tiles.tsx"}],
+            "tilewidth": 128,
+            "type": "map",
+            "version": "1.10",
+            "width": self.width,
+        }
+
+    def save(self, filename):
+        # The tileset is referenced relatively, keep maps one folder below assets/maps
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        with open(filename, 'w') as file:
+            json.dump(self.to_json(), file)
+        return filename
+    #endregion SAVE
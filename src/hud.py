@@ -0,0 +1,55 @@
+import time
+import arcade
+import pyglet
+
+from src.constants import HUD_FONT_NAME, HUD_REFRESH_RATE
+
+class Hud:
+    # Texts share one pyglet batch, drawn at once and laid out again only when their value changes
+
+    def __init__(self, refresh_rate=HUD_REFRESH_RATE):
+        self.batch = pyglet.graphics.Batch()
+        self.labels = {}
+        self.templates = {}
+        self.values = {}
+        self.refresh_delay = 1 / refresh_rate
+        self.refresh_time = 0
+
+    def create_label(self, text, start_x, start_y, color, font_size):
+        return pyglet.text.Label(
+            text=text,
+            x=start_x,
+            y=start_y,
+            font_name=HUD_FONT_NAME,
+            font_size=font_size,
+            color=arcade.get_four_byte_color(color),
+            anchor_x="left",
+            anchor_y="top",
+            batch=self.batch,
+        )
+
+    def add_text(self, text, start_x, start_y, color=arcade.color.WHITE, font_size=12):
+        self.create_label(text, start_x, start_y, color, font_size)
+
+    def add_field(self, name, template, start_x, start_y, color=arcade.color.WHITE, font_size=12):
+        self.labels[name] = self.create_label('', start_x, start_y, color, font_size)
+        self.templates[name] = template
+        self.values[name] = None
+
+    def update_field(self, name, value):
+        if value == self.values[name]:
+            return
+        self.values[name] = value
+        self.labels[name].text = self.templates[name].format(value)
+
+    def is_refresh_due(self):
+        # Fields refresh at the display rate, whatever the simulation rate
+        now = time.perf_counter()
+        if now - self.refresh_time < self.refresh_delay:
+            return False
+        self.refresh_time = now
+        return True
+
+    def draw(self):
+        with arcade.get_window().ctx.pyglet_rendering():
+            self.batch.draw()
@@ -0,0 +1,93 @@
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.constants import METRICS_HOST, METRICS_WINDOW
+
+class Metrics:
+    # Written by the simulation loop only, read by the server thread without locks
+    # Counters add up the main agent and the population, the noise follows the main agent
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.steps = 0
+        self.episodes = 0
+        self.wins = 0
+        self.score = 0.0
+        self.scores = deque(maxlen=METRICS_WINDOW)
+        self.states = 0
+        self.noise = 0.0
+        self.saves = 0
+        self.save_seconds = 0.0
+
+    def update_step(self, simulation):
+        self.steps += 1
+        self.states = len(simulation.agent.qtable)
+
+        if simulation.agent is self.agent:
+            self.noise = self.agent.noise
+
+    def update_win(self):
+        self.wins += 1
+
+    def update_episode(self, score):
+        self.episodes += 1
+        self.scores.append(score)
+        self.score = sum(self.scores) / len(self.scores)
+
+    def update_save(self, seconds):
+        self.saves += 1
+        self.save_seconds += seconds
+
+class MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+
+        body = self.server.metrics_server.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsServer:
+
+    def __init__(self, metrics, port):
+        self.metrics = metrics
+        self.port = port
+
+        self.http_server = HTTPServer((METRICS_HOST, port), MetricsHandler)
+        self.http_server.metrics_server = self
+        self.thread = threading.Thread(target=self.http_server.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.http_server.shutdown()
+        self.http_server.server_close()
+
+    def render(self):
+        metrics = [
+            ('steps_total', 'counter', 'Simulation steps of all players', self.metrics.steps),
+            ('episodes_total', 'counter', 'Episodes ended by a reset of an agent', self.metrics.episodes),
+            ('wins_total', 'counter', 'Goals reached by all players', self.metrics.wins),
+            ('rolling_score', 'gauge', f'Mean score of the last {METRICS_WINDOW} episodes', self.metrics.score),
+            ('qtable_states', 'gauge', 'States in the agent qtable', self.metrics.states),
+            ('noise', 'gauge', 'Agent noise level', self.metrics.noise),
+            ('saves_total', 'counter', 'Saves of the agent qtable', self.metrics.saves),
+            ('save_seconds_total', 'counter', 'Time spent saving the agent qtable', self.metrics.save_seconds),
+        ]
+
+        lines = []
+        for name, kind, description, value in metrics:
+            lines.append(f'# HELP mephistophelia_{name} {description}')
+            lines.append(f'# TYPE mephistophelia_{name} {kind}')
+            lines.append(f'mephistophelia_{name} {value}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,61 @@
+import json
+import struct
+import zlib
+
+# Standalone on purpose: no arcade, pickle or matplotlib, the file can be copied out with its policy
+POLICY_MAGIC = b'MPHP'
+POLICY_RADARS = 7
+POLICY_RADAR_TILES = {'*': 0, 'PF': 1, 'DG': 2, 'GO': 3}
+POLICY_TABLE_SIZE = POLICY_RADARS << (2 * POLICY_RADARS)
+
+def encode_radar_state(radars_state):
+    # 2 bits per radar tile, then the index of the radar closest to the goal
+    code = 0
+    closest = 0
+    for i, (tile, is_closest) in enumerate(radars_state):
+        code |= POLICY_RADAR_TILES[tile] << (2 * i)
+        if is_closest:
+            closest = i
+    return code | closest << (2 * POLICY_RADARS)
+
+class Policy:
+    # Frozen greedy action index for every radar state code
+
+    def __init__(self, actions, table, metadata=None):
+        self.actions = actions
+        self.table = table
+        self.metadata = metadata or {}
+
+    def action_index(self, code):
+        return self.table[code]
+
+    def action(self, radars_state):
+        return self.actions[self.table[encode_radar_state(radars_state)]]
+
+    #region SAVE
+    def save(self, filename):
+        metadata = json.dumps({'actions': self.actions, **self.metadata}).encode()
+        table = zlib.compress(bytes(self.table))
+
+        with open(filename, 'wb') as file:
+            file.write(POLICY_MAGIC)
+            file.write(struct.pack('<II', len(metadata), len(table)))
+            file.write(metadata)
+            file.write(table)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as file:
+            if file.read(4) != POLICY_MAGIC:
+                raise ValueError(f'{filename} is not a policy file')
+
+            metadata_size, table_size = struct.unpack('<II', file.read(8))
+            metadata = json.loads(file.read(metadata_size))
+            table = zlib.decompress(file.read(table_size))
+
+        if len(table) != POLICY_TABLE_SIZE:
+            raise ValueError(f'{filename} has a table of {len(table)} actions, expected {POLICY_TABLE_SIZE}')
+
+        actions = metadata.pop('actions')
+        return cls(actions, table, metadata)
+    #endregion SAVE
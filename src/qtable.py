@@ -0,0 +1,70 @@
+import pickle
+import struct
+
+from src.constants import AGENT_ACTIONS, QTABLE_DTYPES
+
+def prune_qtable(qtable, visits, threshold, min_visits=0, protected=()):
+    # Rarely visited and near-zero states are dropped, agents add them back with zeros when seen again
+    # Without visit counts, states are pruned on their values only
+    use_visits = bool(visits)
+    pruned = [
+        key for key, values in qtable.items()
+        if key not in protected and (
+            (use_visits and visits.get(key, 0) < min_visits)
+            or max(abs(value) for value in values.values()) <= threshold
+        )
+    ]
+
+    for key in pruned:
+        del qtable[key]
+        visits.pop(key, None)
+
+    return len(pruned)
+
+class CompactQTable:
+    # Qtable values packed in one buffer, in the order of the states and AGENT_ACTIONS
+
+    def __init__(self, states, dtype, scale, data):
+        self.states = states
+        self.dtype = dtype
+        self.scale = scale
+        self.data = data
+
+    @classmethod
+    def from_qtable(cls, qtable, dtype):
+        states = list(qtable)
+        values = [qtable[state][action] for state in states for action in AGENT_ACTIONS]
+
+        if dtype == QTABLE_DTYPES[1]:
+            # Clamp to the float16 range
+            scale = 1.0
+            data = struct.pack(f'<{len(values)}e', *[min(max(value, -65504.0), 65504.0) for value in values])
+        elif dtype == QTABLE_DTYPES[2]:
+            scale = max((abs(value) for value in values), default=0.0) / 127 or 1.0
+            data = struct.pack(f'<{len(values)}b', *[round(value / scale) for value in values])
+        else:
+            raise ValueError(f'Unknown qtable dtype {dtype}')
+
+        return cls(states, dtype, scale, data)
+
+    def to_qtable(self):
+        count = len(self.states) * len(AGENT_ACTIONS)
+        if self.dtype == QTABLE_DTYPES[1]:
+            values = struct.unpack(f'<{count}e', self.data)
+        else:
+            values = struct.unpack(f'<{count}b', self.data)
+
+        qtable = {}
+        for i, state in enumerate(self.states):
+            qtable[state] = {}
+            for j, action in enumerate(AGENT_ACTIONS):
+                qtable[state][action] = values[i * len(AGENT_ACTIONS) + j] * self.scale
+        return qtable
+
+def load_qtable(filename):
+    # Compact qtables are expanded back into the dict of dicts agents learn into
+    with open(filename, 'rb') as file:
+        qtable = pickle.load(file)
+    if isinstance(qtable, CompactQTable):
+        qtable = qtable.to_qtable()
+    return qtable
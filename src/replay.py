@@ -0,0 +1,43 @@
+import os
+import time
+
+from src.constants import PLAY_MODES, SIMULATION_DELTA_TIME, STATE_DISCRETIZERS
+from src.simulation import Simulation
+from src.trajectory import Trajectory
+
+class Replay:
+
+    def __init__(self, player_path, trajectory_path):
+        # Set origin path
+        file_path = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(file_path)
+
+        self.player_path = player_path
+        self.trajectory = Trajectory.load(trajectory_path)
+        self.simulation = None
+        self.steps_per_second = 0
+
+    def run(self):
+        metadata = self.trajectory.metadata
+
+        self.simulation = Simulation()
+        self.simulation.setup_simulation(
+            self.player_path, metadata['map_path'], None,
+            PLAY_MODES[1], metadata['view_mode'], metadata['learning_mode'],
+            metadata['learning_rate'], metadata['discount_factor'],
+            metadata['noise'], metadata['noise_decay'], metadata['seed'],
+            metadata.get('state_discretizer', STATE_DISCRETIZERS[0]),
+        )
+        self.simulation.start_replay(self.trajectory)
+        self.simulation.start_recording()
+
+        # Re-simulate at full speed, recording the new trajectory to compare against
+        start_time = time.perf_counter()
+        while not self.trajectory.is_done():
+            # A diverged replay can win where the recording did not, and would stay paused
+            if self.simulation.is_paused():
+                break
+            self.simulation.update_simulation(SIMULATION_DELTA_TIME)
+        self.steps_per_second = len(self.trajectory.steps) / max(time.perf_counter() - start_time, 1E-9)
+
+        return self.trajectory.diverged_step(self.simulation.trajectory)
@@ -0,0 +1,628 @@
+import math
+import os
+import time
+import arcade
+
+from src.constants import \
+    AGENT_ACTIONS, AGENT_REWARD_DEATH, AGENT_REWARD_GOAL, AGENT_REWARD_STEP, \
+    GRAVITY, \
+    MAP_LAYER_DEATHGROUND, MAP_LAYER_FOREGROUND, MAP_LAYER_GOAL, MAP_LAYER_PLATFORMS, MAP_LAYER_PLAYER, \
+    MAP_TAG_DEATHGROUND, MAP_TAG_GOAL, MAP_TAG_PLATFORMS, \
+    PLAY_MODES,\
+    POPULATION_ALPHA, \
+    PLAYER_DASH_COOLDOWN, PLAYER_DASH_DURATION, PLAYER_DASH_SPEED, PLAYER_JUMP_SPEED, PLAYER_MOVEMENT_SPEED, \
+    STATE_DISCRETIZERS, \
+    TILE_PIXEL_SIZE, TILE_SCALING, \
+    TRAJECTORY_RESET, TRAJECTORY_RESET_AGENT, \
+    VIEW_MODES
+from src.agent import Agent
+from src.metrics import Metrics, MetricsServer
+from src.player import Player
+from src.spatial import SpatialIndex
+from src.trajectory import Trajectory
+
+class Simulation:
+
+    def __init__(self):
+        # Set origin path
+        file_path = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(file_path)
+
+        # Tilemap Object
+        self.tile_map = None
+
+        # Game Scene Object
+        self.scene = None
+
+        # Static layers collision index
+        self.spatial_index = None
+
+        # Physics engine Object
+        self.physics_engine = None
+
+        # State machine
+        self.left_pressed = False
+        self.right_pressed = False
+        self.up_pressed = False
+        self.space_pressed = False
+        self.dashing = False
+        self.dash_timer = 0
+        self.dash_cooldown = 0
+        self.dash_direction = (0, 0)
+        self.win = False
+
+        # Mode
+        self.play_mode = None
+        self.view_mode = None
+
+        # Map bounds
+        self.map_x_bound = 0
+        self.map_y_bound = 0
+
+        # Goal object
+        self.goal_x = 0
+        self.goal_y = 0
+
+        # Player Object
+        self.player = None
+        self.player_start_x = 0
+        self.player_start_y = 0
+
+        # AI agent
+        self.agent = None
+        self.agent_reward = 0
+        self.agent_action = None
+        self.agent_radars = None
+        self.agent_hitbox = None
+        self.agent_save_path = None
+        self.agent_iteration = 0
+        self.agent_greedy = False
+
+        # Trajectories
+        self.map_path = None
+        self.agent_params = None
+        self.trajectory = None
+        self.replay_trajectory = None
+
+        # Metrics
+        self.metrics = None
+        self.metrics_server = None
+
+        # Population sharing the agent qtable
+        self.population = []
+
+    def setup_simulation(
+        self, player_path, map_path, save_path, play_mode, view_mode, learning_mode, learning_rate, discount_factor,
+        noise=0.0, noise_decay=1E-4, seed=None, state_discretizer=STATE_DISCRETIZERS[0],
+    ):
+        # Set mode
+        self.play_mode = play_mode
+        self.view_mode = view_mode
+
+        self.setup_map(map_path)
+        self.setup_player(player_path)
+
+        # Set the AI agent
+        if self.is_agent_play():
+            self.setup_agent(learning_mode, learning_rate, discount_factor, noise, noise_decay, seed, state_discretizer)
+
+            self.agent_save_path = save_path
+            if self.agent_save_path is not None:
+                self.agent.load_save(save_path)
+
+            self.setup_agent_radars()
+
+    def setup_map(self, map_path):
+        self.map_path = map_path
+
+        # Set map layers options
+        map_layer_options = {
+            MAP_LAYER_PLATFORMS: {
+                "use_spatial_hash": True,
+            },
+            MAP_LAYER_DEATHGROUND: {
+                "use_spatial_hash": True,
+            },
+        }
+
+        # Load the map
+        self.tile_map = arcade.load_tilemap(map_path, TILE_SCALING, map_layer_options)
+        self.scene = arcade.Scene.from_tilemap(self.tile_map)
+
+        # Index the static layers together, one query tells all the layers a sprite hits
+        self.spatial_index = SpatialIndex(TILE_PIXEL_SIZE)
+        self.spatial_index.add_layer(self.scene[MAP_LAYER_PLATFORMS], MAP_TAG_PLATFORMS)
+        self.spatial_index.add_layer(self.scene[MAP_LAYER_DEATHGROUND], MAP_TAG_DEATHGROUND)
+        self.spatial_index.add_layer(self.scene[MAP_LAYER_GOAL], MAP_TAG_GOAL)
+
+        # Locate edges of the map
+        self.map_x_bound = int(self.tile_map.width * TILE_PIXEL_SIZE)
+        self.map_y_bound = int(self.tile_map.height * TILE_PIXEL_SIZE)
+
+        # Load the player layer
+        self.scene.add_sprite_list_after(MAP_LAYER_PLAYER, MAP_LAYER_FOREGROUND)
+
+        # Locate goal
+        self.goal_x = int(self.tile_map.get_tilemap_layer("Goal").properties["x"]) * TILE_PIXEL_SIZE - TILE_PIXEL_SIZE / 2
+        self.goal_y = int(self.tile_map.get_tilemap_layer("Goal").properties["y"]) * TILE_PIXEL_SIZE - TILE_PIXEL_SIZE / 2
+
+    def setup_player(self, player_path):
+        # Set the player at start position
+        self.player = Player(player_path)
+        self.player_start_x = int(self.tile_map.get_tilemap_layer("Player").properties["start_x"]) * TILE_PIXEL_SIZE - TILE_PIXEL_SIZE / 2
+        self.player_start_y = int(self.tile_map.get_tilemap_layer("Player").properties["start_y"]) * TILE_PIXEL_SIZE - TILE_PIXEL_SIZE / 2
+        self.player.center_x = self.player_start_x
+        self.player.center_y = self.player_start_y
+        self.scene.add_sprite(MAP_LAYER_PLAYER, self.player)
+
+        # Set the physics engine
+        self.physics_engine = arcade.PhysicsEnginePlatformer(
+            self.player,
+            gravity_constant=GRAVITY,
+            walls=self.scene[MAP_LAYER_PLATFORMS]
+        )
+
+    def setup_agent(self, learning_mode, learning_rate, discount_factor, noise, noise_decay, seed, state_discretizer, qtable=None, visits=None):
+        self.agent = Agent(
+            int(self.player_start_x),
+            int(self.player_start_y),
+            self.map_x_bound,
+            self.map_y_bound,
+            learning_mode = learning_mode,
+            learning_rate = learning_rate,
+            discount_factor = discount_factor,
+            noise = noise,
+            noise_decay = noise_decay,
+            seed = seed,
+            qtable = qtable,
+            state_discretizer = state_discretizer,
+            visits = visits,
+        )
+        self.agent_params = {
+            'learning_mode': learning_mode,
+            'learning_rate': learning_rate,
+            'discount_factor': discount_factor,
+            'noise': noise,
+            'noise_decay': noise_decay,
+            'seed': seed,
+            'state_discretizer': state_discretizer,
+        }
+
+    def setup_agent_radars(self):
+        if self.agent.is_learning_radar():
+            self.agent_radars = []
+
+            # Set the radars
+            # left - right - up - up_left - up_right - down_left - down_right
+            for i in range(0, 7):
+                self.agent_radars.append(arcade.Sprite(
+                    '../assets/sprites/radar/radar.png',
+                    image_height=TILE_PIXEL_SIZE,
+                    image_width=TILE_PIXEL_SIZE,
+                    center_x=TILE_PIXEL_SIZE / 2,
+                    center_y=TILE_PIXEL_SIZE / 2,
+                ))
+                self.scene.add_sprite(MAP_LAYER_PLAYER, self.agent_radars[i])
+
+            # Set the hitbox
+            self.agent_hitbox = arcade.Sprite(
+                '../assets/sprites/radar/hitbox.png',
+                center_x=self.player.center_x,
+                center_y=self.player.center_y,
+            )
+            self.scene.add_sprite(MAP_LAYER_PLAYER, self.agent_hitbox)
+
+            # Set radars positions
+            self.process_agent_radar()
+
+        self.agent.state = self.update_agent_state()
+        self.agent.add_state(self.agent.state)
+
+    def setup_population(self, player_path, noises, seed=None):
+        # Each member plays on the shared scene and learns into the shared qtable
+        for i, noise in enumerate(noises):
+            member = Simulation()
+            member.setup_member(self, player_path, noise, None if seed is None else seed + i + 1)
+            self.population.append(member)
+
+    def setup_member(self, leader, player_path, noise, seed):
+        self.play_mode = leader.play_mode
+        self.view_mode = leader.view_mode
+        self.map_path = leader.map_path
+        self.tile_map = leader.tile_map
+        self.scene = leader.scene
+        self.spatial_index = leader.spatial_index
+        self.map_x_bound = leader.map_x_bound
+        self.map_y_bound = leader.map_y_bound
+        self.goal_x = leader.goal_x
+        self.goal_y = leader.goal_y
+
+        self.setup_player(player_path)
+        self.player.alpha = POPULATION_ALPHA
+
+        # Members keep their noise level to spread the exploration
+        params = leader.agent_params
+        self.setup_agent(
+            params['learning_mode'], params['learning_rate'], params['discount_factor'],
+            noise, 0.0, seed, params['state_discretizer'],
+            qtable=leader.agent.qtable,
+            visits=leader.agent.visits,
+        )
+        self.setup_agent_radars()
+
+    #region INPUTS
+    def on_agent_input(self):
+        if self.agent_action == AGENT_ACTIONS[0]:
+            self.left_pressed = True
+        elif self.agent_action == AGENT_ACTIONS[1]:
+            self.right_pressed = True
+        elif self.agent_action == AGENT_ACTIONS[2]:
+            self.left_pressed = True
+            self.up_pressed = True
+        elif self.agent_action == AGENT_ACTIONS[3]:
+            self.right_pressed = True
+            self.up_pressed = True
+
+        self.on_key_change()
+
+    def on_key_change(self):
+        self.process_movement()
+        self.process_jump()
+        self.process_dash()
+
+        if self.is_agent_play() and self.agent.is_learning_radar():
+            self.process_agent_radar()
+
+    def reset_inputs(self):
+        self.left_pressed = False
+        self.right_pressed = False
+        self.up_pressed = False
+        self.space_pressed = False
+    #endregion INPUTS
+
+    #region ACTIONS
+    def can_jump(self):
+        return self.up_pressed and self.physics_engine.can_jump()
+
+    def can_dash(self):
+        return self.space_pressed \
+            and self.dash_timer == 0 \
+            and self.dash_cooldown == 0
+
+    def process_movement(self):
+        if self.right_pressed and not self.left_pressed:
+            self.player.change_x = PLAYER_MOVEMENT_SPEED
+        elif self.left_pressed and not self.right_pressed:
+            self.player.change_x = -PLAYER_MOVEMENT_SPEED
+        else:
+            self.player.change_x = 0
+
+    def process_jump(self):
+        if self.can_jump():
+            self.player.change_y = PLAYER_JUMP_SPEED
+
+    def process_dash(self):
+        if self.can_dash():
+            self.dash_timer = PLAYER_DASH_DURATION
+            self.dash_direction = (
+                int(self.right_pressed) - int(self.left_pressed),
+                int(self.up_pressed),
+            )
+
+    def process_agent_radar(self):
+        # left
+        self.agent_radars[0].center_x = self.player.center_x - TILE_PIXEL_SIZE
+        self.agent_radars[0].center_y = self.player.center_y - TILE_PIXEL_SIZE / 2
+        # right
+        self.agent_radars[1].center_x = self.player.center_x + TILE_PIXEL_SIZE
+        self.agent_radars[1].center_y = self.player.center_y - TILE_PIXEL_SIZE / 2
+        # up
+        self.agent_radars[2].center_x = self.player.center_x
+        self.agent_radars[2].center_y = self.player.center_y + TILE_PIXEL_SIZE * 1.5
+        # up_left
+        self.agent_radars[3].center_x = self.player.center_x - TILE_PIXEL_SIZE
+        self.agent_radars[3].center_y = self.player.center_y + TILE_PIXEL_SIZE * 1.5
+        # up_right
+        self.agent_radars[4].center_x = self.player.center_x + TILE_PIXEL_SIZE
+        self.agent_radars[4].center_y = self.player.center_y + TILE_PIXEL_SIZE * 1.5
+        # down_left
+        self.agent_radars[5].center_x = self.player.center_x - TILE_PIXEL_SIZE
+        self.agent_radars[5].center_y = self.player.center_y - TILE_PIXEL_SIZE * 1.5
+        # down_right
+        self.agent_radars[6].center_x = self.player.center_x + TILE_PIXEL_SIZE
+        self.agent_radars[6].center_y = self.player.center_y - TILE_PIXEL_SIZE * 1.5
+        # hitbox
+        self.agent_hitbox.center_x = self.player.center_x
+        self.agent_hitbox.center_y = self.player.center_y
+    #endregion ACTIONS
+
+    #region COLLISIONS
+    def check_out_of_bounds(self):
+        if self.player.center_y < -100:
+            if self.is_human_play():
+                self.reset_player_position()
+            elif self.is_agent_play():
+                self.agent_reward += AGENT_REWARD_DEATH
+                self.reset_player_position(reset_agent=False)
+
+    def check_collision_with_platforms(self, sprite, tags=None):
+        if tags is None:
+            tags = self.spatial_index.query_sprite(sprite)
+
+        if tags & MAP_TAG_PLATFORMS:
+            return True
+        return False
+
+    def check_collision_with_deathground(self, sprite, tags=None):
+        if tags is None:
+            tags = self.spatial_index.query_sprite(sprite)
+
+        if tags & MAP_TAG_DEATHGROUND:
+            if sprite == self.player:
+                if self.is_human_play():
+                    self.reset_player_position()
+                elif self.is_agent_play():
+                    self.agent_reward += AGENT_REWARD_DEATH
+                    self.reset_player_position(reset_agent=False)
+            return True
+        return False
+
+    def check_collision_with_warps(self, sprite):
+        map_left_warp = (sprite.width / 2)
+        map_right_warp = self.map_x_bound - (sprite.width / 2)
+
+        if sprite.center_x > map_right_warp:
+            sprite.center_x = map_left_warp
+        if sprite.center_x < map_left_warp:
+            sprite.center_x = map_right_warp
+
+    def check_collision_with_goal(self, sprite, tags=None):
+        if tags is None:
+            tags = self.spatial_index.query_sprite(sprite)
+
+        if tags & MAP_TAG_GOAL:
+            if sprite == self.player:
+                self.win = True
+
+                if self.is_agent_play():
+                    self.agent_reward += AGENT_REWARD_GOAL
+                    self.agent_iteration += 1
+
+                    if self.metrics is not None:
+                        self.metrics.update_win()
+            return True
+        return False
+    #endregion COLLISIONS
+
+    #region CYCLE
+    def update_simulation(self, delta_time):
+        if self.is_replaying():
+            self.update_replay_events()
+
+        if self.win:
+            if self.is_analytic_view():
+                return
+            elif self.is_auto_view():
+                self.reset_player_position()
+
+        self.physics_engine.update()
+
+        if self.is_agent_play():
+            self.update_agent_input()
+
+        self.update_dash(delta_time)
+
+        # The radars were placed on input and do not follow the player through resets and warps
+        sprites = [self.player]
+        if self.is_agent_play() and self.agent.is_learning_radar():
+            sprites.extend(self.agent_radars)
+        tags = self.spatial_index.query(sprites)
+
+        self.check_collision_with_goal(self.player, tags[0])
+        self.check_collision_with_deathground(self.player, tags[0])
+        self.check_collision_with_warps(self.player)
+        self.check_out_of_bounds()
+
+        if self.is_agent_play():
+            self.update_agent(tags[1:])
+
+        if self.trajectory is not None:
+            self.trajectory.add_step(self.agent_action, self.player)
+
+        if self.metrics is not None:
+            self.metrics.update_step(self)
+
+    def update_population(self, delta_time):
+        for member in self.population:
+            # Members restart on their own after a win, so they keep learning while the analytic view holds
+            if member.is_paused():
+                member.reset_player_position()
+            member.update_simulation(delta_time)
+
+    def reset_population(self, reset_agent=True):
+        for member in self.population:
+            member.reset_player_position(reset_agent)
+
+    def update_agent_input(self):
+        if self.is_replaying():
+            self.agent_action = self.replay_trajectory.next_action()
+        elif self.agent.is_learning_random() and not self.agent_greedy:
+            self.agent_action = self.agent.random_action()
+        else:
+            self.agent_action = self.agent.best_action()
+
+        self.reset_inputs()
+        self.on_agent_input()
+
+        self.agent_reward += AGENT_REWARD_STEP
+
+    def update_agent(self, radar_tags=None):
+        new_state = self.update_agent_state(radar_tags)
+
+        self.agent.update(
+            self.agent_action,
+            new_state,
+            self.agent_reward,
+        )
+
+        self.agent_reward = 0
+
+    def update_agent_state(self, radar_tags=None):
+        if self.agent.is_learning_radar():
+            return self.update_agent_radar_state(radar_tags)
+        else:
+            return self.agent.discretizer.state(self.player)
+
+    def update_agent_radar_state(self, radar_tags=None):
+        radars_state = []
+        radars_to_goal = []
+
+        if radar_tags is None:
+            radar_tags = self.spatial_index.query(self.agent_radars)
+
+        for radar, tags in zip(self.agent_radars, radar_tags):
+            if self.check_collision_with_platforms(radar, tags):
+                radar_state = ('PF', False)
+            elif self.check_collision_with_deathground(radar, tags):
+                radar_state = ('DG', False)
+            elif self.check_collision_with_goal(radar, tags):
+                radar_state = ('GO', False)
+            else:
+                radar_state = ('*', False)
+
+            radar_to_goal = math.sqrt((radar.center_x - self.goal_x) ** 2 + (radar.center_y - self.goal_y) ** 2)
+            radars_to_goal.append(radar_to_goal)
+
+            radars_state.append(radar_state)
+
+        closest_radar_index = radars_to_goal.index(min(radars_to_goal))
+        radars_state[closest_radar_index] = (radars_state[closest_radar_index][0], True)
+
+        return tuple(radars_state)
+
+    def update_dash(self, delta_time):
+        if self.dash_timer > 0:
+            self.dash_timer -= delta_time
+            dash_length = math.sqrt(self.dash_direction[0] ** 2 + self.dash_direction[1] ** 2)
+
+            if dash_length > 0:
+                self.dash_direction = (
+                    self.dash_direction[0] / dash_length,
+                    self.dash_direction[1] / dash_length,
+                )
+
+            self.player.change_x = self.dash_direction[0] * PLAYER_DASH_SPEED
+            self.player.change_y = self.dash_direction[1] * PLAYER_DASH_SPEED
+
+            self.dashing = True
+        else:
+            if self.dashing:
+                self.player.change_x = PLAYER_MOVEMENT_SPEED * self.dash_direction[0]
+                self.player.change_y = PLAYER_MOVEMENT_SPEED * self.dash_direction[1]
+                self.dashing = False
+                self.dash_cooldown = PLAYER_DASH_COOLDOWN
+
+            if self.dash_cooldown > 0:
+                self.dash_cooldown = max(0, self.dash_cooldown - delta_time)
+
+            self.dash_timer = 0
+            self.dash_direction = (0, 0)
+
+    def reset_player_position(self, reset_agent=True):
+        self.player.change_x = 0
+        self.player.change_y = 0
+        self.player.center_x = self.player_start_x
+        self.player.center_y = self.player_start_y
+        self.reset_inputs()
+        self.win = False
+
+        if self.is_agent_play() and reset_agent:
+            self.agent.state = self.update_agent_state()
+            self.agent.reset()
+
+            if self.metrics is not None:
+                self.metrics.update_episode(self.agent.history[-1])
+
+    def save_agent(self):
+        start_time = time.perf_counter()
+        self.agent.save(self.agent_save_path)
+
+        if self.metrics is not None:
+            self.metrics.update_save(time.perf_counter() - start_time)
+    #endregion CYCLE
+
+    #region TRAJECTORY
+    def start_recording(self):
+        self.trajectory = Trajectory({
+            'map_path': self.map_path,
+            'view_mode': self.view_mode,
+            **self.agent_params,
+        })
+
+    def record_reset(self, reset_agent):
+        if self.trajectory is not None:
+            self.trajectory.add_reset(reset_agent)
+
+    def start_replay(self, trajectory):
+        self.replay_trajectory = trajectory
+
+    def update_replay_events(self):
+        # Resets are applied before the win check, like the key presses they were recorded from
+        if self.replay_trajectory.is_done():
+            self.replay_trajectory = None
+            return
+
+        events = self.replay_trajectory.next_events()
+        if events & TRAJECTORY_RESET_AGENT:
+            self.reset_player_position()
+            self.record_reset(reset_agent=True)
+        elif events & TRAJECTORY_RESET:
+            self.reset_player_position(reset_agent=False)
+            self.record_reset(reset_agent=False)
+    #endregion TRAJECTORY
+
+    #region METRICS
+    def start_metrics(self, port):
+        self.metrics = Metrics(self.agent)
+        self.metrics_server = MetricsServer(self.metrics, port)
+        self.metrics_server.start()
+
+        # Members count into the same metrics
+        for member in self.population:
+            member.metrics = self.metrics
+    #endregion METRICS
+
+    #region PRUNING
+    def start_pruning(self, every, threshold=0.0, min_visits=0):
+        # Only the leader prunes, members share its qtable and visit counts
+        self.agent.prune_every = every
+        self.agent.prune_threshold = threshold
+        self.agent.prune_min_visits = min_visits
+    #endregion PRUNING
+
+    #region UTILS
+    def is_human_play(self):
+        return self.play_mode == PLAY_MODES[0]
+
+    def is_agent_play(self):
+        return self.play_mode == PLAY_MODES[1]
+
+    def is_analytic_view(self):
+        return self.view_mode == VIEW_MODES[0]
+
+    def is_auto_view(self):
+        return self.view_mode == VIEW_MODES[1]
+
+    def is_replaying(self):
+        return self.replay_trajectory is not None
+
+    def is_paused(self):
+        # A win holds the analytic view until a reset, recorded resets included
+        if not (self.win and self.is_analytic_view()):
+            return False
+        return not (
+            self.is_replaying()
+            and not self.replay_trajectory.is_done()
+            and self.replay_trajectory.next_events()
+        )
+    #endregion UTILS
@@ -0,0 +1,34 @@
+import math
+import arcade
+
+class SpatialIndex:
+    # One grid over all static layers, each cell lists its sprites with the tag of their layer
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def add_layer(self, sprite_list, tag):
+        for sprite in sprite_list:
+            for cell in self.get_cells(sprite):
+                self.cells.setdefault(cell, []).append((sprite, tag))
+
+    def get_cells(self, sprite):
+        # Cells overlapped by the hit box bounds, any colliding sprites share at least one
+        min_x = math.floor(sprite.left / self.cell_size)
+        max_x = math.floor(sprite.right / self.cell_size)
+        min_y = math.floor(sprite.bottom / self.cell_size)
+        max_y = math.floor(sprite.top / self.cell_size)
+        return [(x, y) for x in range(min_x, max_x + 1) for y in range(min_y, max_y + 1)]
+
+    def query(self, sprites):
+        return [self.query_sprite(sprite) for sprite in sprites]
+
+    def query_sprite(self, sprite):
+        # Layer tags hit by the sprite, exact against the hit boxes like arcade collisions
+        tags = 0
+        for cell in self.get_cells(sprite):
+            for other, tag in self.cells.get(cell, ()):
+                if not tags & tag and arcade.check_for_collision(sprite, other):
+                    tags |= tag
+        return tags
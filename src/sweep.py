@@ -0,0 +1,191 @@
+import csv
+import itertools
+import os
+import pickle
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from src.constants import PLAY_MODES, SIMULATION_DELTA_TIME, VIEW_MODES
+from src.simulation import Simulation
+
+SWEEP_PARAMS = ['learning_mode', 'state_discretizer', 'learning_rate', 'discount_factor', 'noise', 'noise_decay']
+
+class Trial:
+
+    def __init__(self, trial_id, params, seed):
+        self.trial_id = trial_id
+        self.params = params
+        self.qtable = None
+        self.history = []
+        self.noise = params['noise']
+        self.seed = seed
+        self.steps = 0
+        self.rung = 0
+        self.won = False
+        self.score = float('-inf')
+
+    def wins(self):
+        return len(self.history)
+
+class Sweep:
+
+    def __init__(
+        self, player_path, map_path, output_path, search_space,
+        samples=1, rung_steps=5000, rungs=4, eta=2, save_best=3, eval_steps=2000, workers=None, seed=None,
+    ):
+        # Set origin path
+        file_path = os.path.dirname(os.path.abspath(__file__))
+        os.chdir(file_path)
+
+        self.player_path = player_path
+        self.map_path = map_path
+        self.output_path = output_path
+        self.search_space = search_space
+
+        # Successive halving
+        self.samples = samples
+        self.rung_steps = rung_steps
+        self.rungs = rungs
+        self.eta = eta
+        self.eval_steps = eval_steps
+
+        self.save_best = save_best
+        self.workers = workers or os.cpu_count()
+        self.random = random.Random(seed)
+        self.trials = []
+
+    #region TRIALS
+    def check_search_space(self):
+        for key in SWEEP_PARAMS:
+            if key not in self.search_space:
+                raise ValueError(f'Missing {key} in the search space')
+
+            values = self.search_space[key]
+            if isinstance(values, tuple) and len(values) != 2:
+                raise ValueError(f'{key} range must be a (low, high) tuple, not {values}')
+            if not isinstance(values, (list, tuple)):
+                raise ValueError(f'{key} must be a list of values or a (low, high) tuple, not {values!r}')
+
+    def sample_trials(self):
+        # Lists are searched as a grid, (low, high) tuples are sampled at random
+        self.check_search_space()
+        grid_keys = [key for key in SWEEP_PARAMS if isinstance(self.search_space[key], list)]
+        range_keys = [key for key in SWEEP_PARAMS if isinstance(self.search_space[key], tuple)]
+        samples = self.samples if range_keys else 1
+
+        self.trials = []
+        for values in itertools.product(*[self.search_space[key] for key in grid_keys]):
+            for _ in range(samples):
+                params = dict(zip(grid_keys, values))
+                for key in range_keys:
+                    low, high = self.search_space[key]
+                    params[key] = self.random.uniform(low, high)
+                self.trials.append(Trial(len(self.trials), params, self.random.randrange(2 ** 32)))
+
+        return self.trials
+
+    def run(self):
+        self.sample_trials()
+        alive = list(self.trials)
+        steps = self.rung_steps
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for rung in range(self.rungs):
+                jobs = [
+                    executor.submit(
+                        run_trial,
+                        self.player_path, self.map_path, trial.params,
+                        trial.qtable, trial.history, trial.noise,
+                        trial.seed + rung, steps, self.eval_steps,
+                    )
+                    for trial in alive
+                ]
+
+                for trial, job in zip(alive, jobs):
+                    trial.qtable, trial.history, trial.noise, trial.won, trial.score = job.result()
+                    trial.steps += steps
+                    trial.rung = rung
+
+                alive.sort(key=lambda trial: (trial.won, trial.score), reverse=True)
+                print(f'rung {rung}: {len(alive)} trials, best won {alive[0].won} with score {alive[0].score:.2f}')
+
+                # Stop the worst trials early
+                if len(alive) <= 1:
+                    break
+                survivors = alive[:max(1, len(alive) // self.eta)]
+
+                # Stopped qtables are only kept while they could still be among the saved ones
+                if rung + 1 < self.rungs and len(survivors) >= self.save_best:
+                    for trial in alive[len(survivors):]:
+                        trial.qtable = None
+
+                alive = survivors
+                steps *= self.eta
+
+        self.save()
+        return self.ranked_trials()
+
+    def ranked_trials(self):
+        return sorted(self.trials, key=lambda trial: (trial.rung, trial.won, trial.score), reverse=True)
+    #endregion TRIALS
+
+    #region SAVE
+    def save(self):
+        os.makedirs(self.output_path, exist_ok=True)
+        ranked = self.ranked_trials()
+
+        with open(os.path.join(self.output_path, 'results.csv'), 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['rank', 'trial', 'rung', 'steps', 'wins', 'won', 'score'] + SWEEP_PARAMS)
+            for rank, trial in enumerate(ranked):
+                writer.writerow(
+                    [rank, trial.trial_id, trial.rung, trial.steps, trial.wins(), trial.won, trial.score]
+                    + [trial.params[key] for key in SWEEP_PARAMS]
+                )
+
+        for trial in ranked[:self.save_best]:
+            with open(os.path.join(self.output_path, f'trial_{trial.trial_id}.qtable'), 'wb') as file:
+                pickle.dump(trial.qtable, file)
+    #endregion SAVE
+
+def run_trial(player_path, map_path, params, qtable, history, noise, seed, steps, eval_steps):
+    simulation = Simulation()
+    simulation.setup_simulation(
+        player_path, map_path, None,
+        PLAY_MODES[1], VIEW_MODES[1], params['learning_mode'],
+        params['learning_rate'], params['discount_factor'],
+        noise, params['noise_decay'], seed, params['state_discretizer'],
+    )
+
+    agent = simulation.agent
+    if qtable is not None:
+        agent.qtable = qtable
+        if agent.is_learning_radar():
+            agent.add_state(agent.state)
+    agent.history = history
+
+    for _ in range(steps):
+        simulation.update_simulation(SIMULATION_DELTA_TIME)
+
+    won, score = evaluate_trial(player_path, map_path, params, agent.qtable, eval_steps)
+    return agent.qtable, agent.history, agent.noise, won, score
+
+def evaluate_trial(player_path, map_path, params, qtable, steps):
+    # One greedy episode without learning or noise, every trial is ranked on the same scale
+    simulation = Simulation()
+    simulation.setup_simulation(
+        player_path, map_path, None,
+        PLAY_MODES[1], VIEW_MODES[0], params['learning_mode'],
+        0.0, 0.0,
+        state_discretizer=params['state_discretizer'],
+    )
+    simulation.agent.qtable = qtable
+    simulation.agent.add_state(simulation.agent.state)
+    simulation.agent_greedy = True
+
+    for _ in range(steps):
+        simulation.update_simulation(SIMULATION_DELTA_TIME)
+        if simulation.win:
+            break
+
+    return simulation.win, simulation.agent.score
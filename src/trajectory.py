@@ -0,0 +1,86 @@
+import json
+import struct
+import zlib
+
+from src.constants import \
+    AGENT_ACTIONS, \
+    TRAJECTORY_ACTION_MASK, TRAJECTORY_CHECKPOINT_STEPS, TRAJECTORY_RESET, TRAJECTORY_RESET_AGENT
+
+TRAJECTORY_MAGIC = b'MPHT'
+
+class Trajectory:
+    # One byte per step: the action index, plus the resets requested before the step
+
+    def __init__(self, metadata=None):
+        self.metadata = metadata or {}
+        self.steps = bytearray()
+        self.checkpoints = []
+        self.checksum = 0
+        self.events = 0
+        self.cursor = 0
+
+    #region RECORD
+    def add_reset(self, reset_agent):
+        self.events |= TRAJECTORY_RESET_AGENT if reset_agent else TRAJECTORY_RESET
+
+    def add_step(self, action, player):
+        self.steps.append(AGENT_ACTIONS.index(action) | self.events)
+        self.events = 0
+
+        # Checksum the player physics so replays can be compared bit for bit
+        self.checksum = zlib.crc32(
+            struct.pack('<4d', player.center_x, player.center_y, player.change_x, player.change_y),
+            self.checksum,
+        )
+        if len(self.steps) % TRAJECTORY_CHECKPOINT_STEPS == 0:
+            self.checkpoints.append(self.checksum)
+    #endregion RECORD
+
+    #region REPLAY
+    def is_done(self):
+        return self.cursor >= len(self.steps)
+
+    def next_events(self):
+        return self.steps[self.cursor] & (TRAJECTORY_RESET | TRAJECTORY_RESET_AGENT)
+
+    def next_action(self):
+        step = self.steps[self.cursor]
+        self.cursor += 1
+        return AGENT_ACTIONS[step & TRAJECTORY_ACTION_MASK]
+
+    def diverged_step(self, other):
+        for i, (checksum, other_checksum) in enumerate(zip(self.checkpoints, other.checkpoints)):
+            if checksum != other_checksum:
+                return i * TRAJECTORY_CHECKPOINT_STEPS
+        if len(self.steps) != len(other.steps) or self.checksum != other.checksum:
+            return min(len(self.checkpoints), len(other.checkpoints)) * TRAJECTORY_CHECKPOINT_STEPS
+        return None
+    #endregion REPLAY
+
+    #region SAVE
+    def save(self, filename):
+        metadata = json.dumps(self.metadata).encode()
+        steps = zlib.compress(bytes(self.steps))
+
+        with open(filename, 'wb') as file:
+            file.write(TRAJECTORY_MAGIC)
+            file.write(struct.pack('<III', len(metadata), len(steps), len(self.checkpoints)))
+            file.write(metadata)
+            file.write(steps)
+            file.write(struct.pack(f'<{len(self.checkpoints)}I', *self.checkpoints))
+            file.write(struct.pack('<I', self.checksum))
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, 'rb') as file:
+            if file.read(4) != TRAJECTORY_MAGIC:
+                raise ValueError(f'{filename} is not a trajectory file')
+
+            metadata_size, steps_size, checkpoints_size = struct.unpack('<III', file.read(12))
+            trajectory = cls(json.loads(file.read(metadata_size)))
+            trajectory.steps = bytearray(zlib.decompress(file.read(steps_size)))
+            trajectory.checkpoints = list(struct.unpack(f'<{checkpoints_size}I', file.read(4 * checkpoints_size)))
+            trajectory.checksum, = struct.unpack('<I', file.read(4))
+
+        return trajectory
+    #endregion SAVE
@@ -0,0 +1,27 @@
+from src.constants import AGENT_LEARNING_MODES, STATE_DISCRETIZERS
+from src.sweep import Sweep
+
+def main():
+    player_path = '../assets/sprites/player/player'
+    map_path    = '../assets/maps/json/map_1-1.json'
+    output_path = '../sweeps/map_1-1'
+
+    # lists are searched as a grid, (low, high) tuples are sampled at random
+    search_space = {
+        'learning_mode':     [AGENT_LEARNING_MODES[1]],
+        'state_discretizer': [STATE_DISCRETIZERS[1]],
+        'learning_rate':     (0.05, 0.5),
+        'discount_factor':   [0.8, 0.9, 0.99],
+        'noise':             [0.0, 1.0],
+        'noise_decay':       [1E-4],
+    }
+
+    sweep = Sweep(
+        player_path, map_path, output_path, search_space,
+        samples=4, rung_steps=5000, rungs=4, eta=2, seed=0,
+    )
+    for rank, trial in enumerate(sweep.run()):
+        print(rank, trial.trial_id, trial.rung, trial.wins(), f'{trial.score:.2f}', trial.params)
+
+if __name__ == "__main__":
+    main()